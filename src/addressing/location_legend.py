@@ -1,6 +1,21 @@
 import json
 from collections import defaultdict
 
+from categorization.process_categorizer import CATEGORY_ID, GENERAL_ID
+
+# Indexed by CATEGORY_ID
+_CATEGORY_COLORS = (
+    '#3B82F6',  # data: Blue
+    '#10B981',  # computation: Green
+    '#F59E0B',  # io: Amber
+    '#EF4444',  # control: Red
+    '#8B5CF6',  # crypto: Purple
+    '#06B6D4',  # network: Cyan
+    '#F97316',  # ui: Orange
+    '#DC2626',  # error: Red-600
+    '#6B7280'   # general: Gray
+)
+
 class LocationLegend:
     """Creates addressable location system for processes with legend mapping."""
     
@@ -24,8 +39,17 @@ class LocationLegend:
             'navigation': {}
         }
         
-        # Create location entries for each process
+        shortcuts = {
+            'entry_points': [],
+            'critical_paths': [],
+            'error_handlers': [],
+            'data_flows': []
+        }
+        
+        # Create location entries and navigation shortcuts in a single pass
         for i, (address, details) in enumerate(categorized_map.items()):
+            navigation_path = self._generate_navigation_path(address, details)
+            
             if i < len(spiral_coordinates):
                 coord_data = spiral_coordinates[i]
                 
@@ -45,11 +69,13 @@ class LocationLegend:
                         'depth': details.get('depth', 0),
                         'subprocesses': details.get('subprocesses', [])
                     },
-                    'navigation_path': self._generate_navigation_path(address, details)
+                    'navigation_path': navigation_path
                 }
                 
                 legend_data['locations'][address] = location_entry
-                self.address_map[address] = coord_data['coords']
+                self.address_map[address] = location_entry['coordinates_3d']
+            
+            self._add_navigation_shortcuts(shortcuts, address, details, navigation_path)
         
         # Group by categories
         for category, processes in self.categorizer.workflows.items():
@@ -59,8 +85,7 @@ class LocationLegend:
                 'color_code': self._get_category_color(category)
             }
         
-        # Create navigation shortcuts
-        legend_data['navigation'] = self._create_navigation_shortcuts(categorized_map)
+        legend_data['navigation'] = shortcuts
         
         self.legend = legend_data
         return legend_data
@@ -82,59 +107,38 @@ class LocationLegend:
     
     def _get_category_color(self, category):
         """Assign color codes to categories for visualization."""
-        color_map = {
-            'data': '#3B82F6',      # Blue
-            'computation': '#10B981', # Green
-            'io': '#F59E0B',        # Amber
-            'control': '#EF4444',   # Red
-            'crypto': '#8B5CF6',    # Purple
-            'network': '#06B6D4',   # Cyan
-            'ui': '#F97316',        # Orange
-            'error': '#DC2626',     # Red-600
-            'general': '#6B7280'    # Gray
-        }
-        return color_map.get(category, '#6B7280')
+        return _CATEGORY_COLORS[CATEGORY_ID.get(category, GENERAL_ID)]
     
-    def _create_navigation_shortcuts(self, categorized_map):
-        """Create quick navigation shortcuts for common operations."""
-        shortcuts = {
-            'entry_points': [],
-            'critical_paths': [],
-            'error_handlers': [],
-            'data_flows': []
-        }
+    def _add_navigation_shortcuts(self, shortcuts, address, details, navigation_path):
+        """Add quick navigation shortcuts for common operations."""
+        # Identify entry points (no parent, depth 0)
+        if details.get('depth', 0) == 0:
+            shortcuts['entry_points'].append({
+                'address': address,
+                'path': navigation_path
+            })
         
-        for address, details in categorized_map.items():
-            # Identify entry points (no parent, depth 0)
-            if details.get('depth', 0) == 0:
-                shortcuts['entry_points'].append({
-                    'address': address,
-                    'path': self._generate_navigation_path(address, details)
-                })
-            
-            # Identify critical computation paths
-            if details['category'] in ['computation', 'crypto']:
-                shortcuts['critical_paths'].append({
-                    'address': address,
-                    'category': details['category'],
-                    'path': self._generate_navigation_path(address, details)
-                })
-            
-            # Identify error handlers
-            if details['category'] == 'error':
-                shortcuts['error_handlers'].append({
-                    'address': address,
-                    'path': self._generate_navigation_path(address, details)
-                })
-            
-            # Identify data flow processes
-            if details['category'] == 'data':
-                shortcuts['data_flows'].append({
-                    'address': address,
-                    'path': self._generate_navigation_path(address, details)
-                })
+        # Identify critical computation paths
+        if details['category'] in ['computation', 'crypto']:
+            shortcuts['critical_paths'].append({
+                'address': address,
+                'category': details['category'],
+                'path': navigation_path
+            })
+        
+        # Identify error handlers
+        if details['category'] == 'error':
+            shortcuts['error_handlers'].append({
+                'address': address,
+                'path': navigation_path
+            })
         
-        return shortcuts
+        # Identify data flow processes
+        if details['category'] == 'data':
+            shortcuts['data_flows'].append({
+                'address': address,
+                'path': navigation_path
+            })
     
     def find_process_by_location(self, coordinates, tolerance=1.0):
         """Find process at specific 3D coordinates."""
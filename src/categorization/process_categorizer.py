@@ -1,6 +1,21 @@
 from collections import defaultdict
+import functools
 import re
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Fixed category set; other modules index per-category tables by CATEGORY_ID
+CATEGORIES = ('data', 'computation', 'io', 'control', 'crypto', 'network', 'ui', 'error', 'general')
+CATEGORY_ID = {category: i for i, category in enumerate(CATEGORIES)}
+GENERAL_ID = CATEGORY_ID['general']
+
+# Subcategory by first letter of the process address; anything else is 'utility'
+_SUBCAT_BY_INITIAL = {'A': 'primary', 'B': 'secondary'}
+
+
 class ProcessCategorizer:
     """Categorizes processes into workflows and subcategories."""
     
@@ -18,30 +33,73 @@ class ProcessCategorizer:
         
         self.workflows = defaultdict(list)
         self.subcategories = defaultdict(dict)
+        self._category_keywords = tuple(
+            (category, tuple(keywords)) for category, keywords in self.categories.items()
+        )
+        self._keyword_automaton = self._build_keyword_automaton() if ahocorasick else None
+        
+        # Workflows repeat the same commands; only unique ones pay for matching
+        self._categorize_command = functools.lru_cache(maxsize=1024)(self._categorize_command)
+    
+    def _build_keyword_automaton(self):
+        """Build a single automaton mapping every keyword to its categories."""
+        owners = defaultdict(list)
+        for rank, keywords in enumerate(self.categories.values()):
+            for keyword in keywords:
+                owners[keyword].append(rank)
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, ranks in owners.items():
+            automaton.add_word(keyword, (keyword, ranks[0]))
+        automaton.make_automaton()
+        
+        return automaton
     
     def categorize_process(self, address, command):
         """Categorize a single process based on its command."""
-        command_lower = command.lower()
-        
-        # Find matching category
-        matched_category = 'general'
-        for category, keywords in self.categories.items():
-            if any(keyword in command_lower for keyword in keywords):
-                matched_category = category
-                break
+        matched_category, keywords = self._categorize_command(command)
         
         return {
             'address': address,
             'command': command,
             'category': matched_category,
-            'keywords': self._extract_keywords(command_lower, matched_category)
+            'keywords': list(keywords)
         }
     
-    def _extract_keywords(self, command, category):
-        """Extract relevant keywords from command for the category."""
-        if category in self.categories:
-            return [kw for kw in self.categories[category] if kw in command]
-        return []
+    def _categorize_command(self, command):
+        """Match a command to its category and keywords."""
+        command_lower = command.lower()
+        
+        if self._keyword_automaton is not None:
+            matched_category, keywords = self._match_automaton(command_lower)
+        else:
+            matched_category, keywords = self._match_keywords(command_lower)
+        
+        return matched_category, tuple(keywords)
+    
+    def _match_keywords(self, command_lower):
+        """Find the first matching category and its keywords in one scan."""
+        for category, keywords in self._category_keywords:
+            hits = [kw for kw in keywords if kw in command_lower]
+            if hits:
+                return category, hits
+        return 'general', []
+    
+    def _match_automaton(self, command_lower):
+        """Find the matching category and its keywords with the keyword automaton."""
+        # Collect every keyword hit in one pass; earlier categories take priority
+        hits = set()
+        best_rank = len(self._category_keywords)
+        for _, (keyword, rank) in self._keyword_automaton.iter(command_lower):
+            hits.add(keyword)
+            if rank < best_rank:
+                best_rank = rank
+        
+        if not hits:
+            return 'general', []
+        
+        category, keywords = self._category_keywords[best_rank]
+        return category, [kw for kw in keywords if kw in hits]
     
     def build_workflow_map(self, workflow_data):
         """Build categorized workflow map from parsed data."""
@@ -50,12 +108,17 @@ class ProcessCategorizer:
         for address, details in workflow_data.items():
             categorized = self.categorize_process(address, details['command'])
             
+            # Parent is everything before the last '.'
+            head, sep, _ = address.rpartition('.')
+            parent = head if sep else None
+            depth = address.count('.')
+            
             # Add original details
             categorized.update({
                 'subprocesses': details.get('subprocesses', []),
                 'direction': details.get('direction'),
-                'parent': self._find_parent(address),
-                'depth': self._calculate_depth(address)
+                'parent': parent,
+                'depth': depth
             })
             
             categorized_map[address] = categorized
@@ -66,16 +129,6 @@ class ProcessCategorizer:
         
         return categorized_map
     
-    def _find_parent(self, address):
-        """Find parent process address."""
-        if '.' in address:
-            return address.rsplit('.', 1)[0]
-        return None
-    
-    def _calculate_depth(self, address):
-        """Calculate nesting depth of process."""
-        return address.count('.')
-    
     def get_workflow_subcategories(self, category):
         """Get subcategories within a workflow category."""
         if category not in self.subcategories:
@@ -84,12 +137,7 @@ class ProcessCategorizer:
             
             for process in processes:
                 # Group by first letter or pattern
-                if process.startswith('A'):
-                    subcats['primary'].append(process)
-                elif process.startswith('B'):
-                    subcats['secondary'].append(process)
-                else:
-                    subcats['utility'].append(process)
+                subcats[_SUBCAT_BY_INITIAL.get(process[:1], 'utility')].append(process)
             
             self.subcategories[category] = dict(subcats)
         
@@ -0,0 +1,21 @@
+"""
+Ahead-of-time build of the spiral kernel.
+Run `python src/geometry/_aot_build.py` to compile _spiral_aot next to this file;
+_spiral_kernels imports it in preference to the JIT-compiled kernel.
+"""
+import os
+import sys
+
+from numba.pycc import CC
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geometry._spiral_kernels import _spiral_kernel_loop
+
+SPIRAL_KERNEL_SIGNATURE = 'void(i8, i8, f8, f8, i8, f8[:], f8[:], f8[:], f8[:], f8[:], f8[:])'
+
+cc = CC('_spiral_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export('spiral_kernel', SPIRAL_KERNEL_SIGNATURE)(_spiral_kernel_loop)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,86 @@
+import numpy as np
+
+# numba.prange once the JIT kernel is compiled; a plain range for the
+# ahead-of-time build and when numba is missing
+prange = range
+
+
+def _spiral_kernel_numpy(n, base, radius, pitch, multiplier, cos_table, sin_table,
+                         out_x, out_y, out_z, out_ang):
+    """Fill preallocated arrays with double-helix coordinates using NumPy."""
+    i = np.arange(n, dtype=np.float64)
+    half_base = base / 2
+
+    # Left spiral going up counts height down from the top
+    steps = i if multiplier > 0 else n - i
+
+    out_ang[:] = (2 * np.pi * multiplier / half_base) * i
+    out_z[:] = (steps * pitch) / half_base
+
+    # Tables hold cos/sin of the right-handed angle (plus strand phase) per residue;
+    # the left-handed spiral mirrors y
+    residue = np.arange(n) % len(cos_table)
+    np.take(cos_table, residue, out=out_x)
+    np.take(sin_table, residue, out=out_y)
+    out_x *= radius
+    out_y *= radius * multiplier
+
+
+def _spiral_kernel_loop(n, base, radius, pitch, multiplier, cos_table, sin_table,
+                        out_x, out_y, out_z, out_ang):
+    """Fill preallocated arrays with double-helix coordinates, one index at a time.
+
+    Only meant to be compiled: prange runs in parallel under the JIT and as a
+    plain range in the ahead-of-time build (see _aot_build.py).
+    """
+    half_base = base / 2
+    angle_step = 2 * np.pi * multiplier / half_base
+    period = len(cos_table)
+
+    for i in prange(n):
+        steps = i if multiplier > 0 else n - i
+        residue = i % period
+
+        out_ang[i] = angle_step * i
+        out_z[i] = (steps * pitch) / half_base
+        out_x[i] = radius * cos_table[residue]
+        out_y[i] = radius * multiplier * sin_table[residue]
+
+
+# NumPy fills a million points in a few milliseconds; below that, compiling the
+# JIT kernel costs far more than it could ever save
+_JIT_MIN_POINTS = 1_000_000
+
+try:
+    # Prebuilt by _aot_build.py; avoids JIT warm-up in short-lived runs
+    from geometry._spiral_aot import spiral_kernel as _prebuilt_kernel
+except ImportError:
+    _prebuilt_kernel = None
+
+_jit_kernel = None  # compiled on the first call with at least _JIT_MIN_POINTS points
+
+
+def _compiled_kernel():
+    """JIT-compile the loop kernel, importing numba only now; NumPy if numba is missing."""
+    global _jit_kernel, prange
+    if _jit_kernel is None:
+        try:
+            import numba
+        except ImportError:
+            _jit_kernel = _spiral_kernel_numpy
+        else:
+            prange = numba.prange
+            _jit_kernel = numba.njit(cache=True, fastmath=True, parallel=True)(_spiral_kernel_loop)
+    return _jit_kernel
+
+
+def spiral_kernel(n, base, radius, pitch, multiplier, cos_table, sin_table,
+                  out_x, out_y, out_z, out_ang):
+    """Fill preallocated arrays with double-helix coordinates using the best available kernel."""
+    if _prebuilt_kernel is not None:
+        kernel = _prebuilt_kernel
+    elif n >= _JIT_MIN_POINTS:
+        kernel = _compiled_kernel()
+    else:
+        kernel = _spiral_kernel_numpy
+    kernel(n, base, radius, pitch, multiplier, cos_table, sin_table, out_x, out_y, out_z, out_ang)
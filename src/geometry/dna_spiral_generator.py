@@ -1,6 +1,128 @@
+import functools
 import math
+import re
+from dataclasses import dataclass
+from typing import ClassVar
+
 import numpy as np
 
+from geometry._spiral_kernels import spiral_kernel
+
+_PROCESS_ID_RE = re.compile(r'(\d+)')
+
+
+@functools.lru_cache(maxsize=8)
+def _base_pair_table(base):
+    """Build the (base, complement) pairing table for a given base size."""
+    # Create unique base identifiers
+    bases = []
+    for i in range(base):
+        if i < 26:
+            bases.append(chr(ord('A') + i))  # A-Z
+        else:
+            bases.append(f"X{i-25}")  # X1-X18 for remaining bases
+    
+    # Create complementary pairs
+    pairs = []
+    for i in range(base // 2):
+        pairs.append((bases[i], bases[base - 1 - i]))
+        pairs.append((bases[base - 1 - i], bases[i]))
+    
+    return tuple(pairs)
+
+
+@dataclass(slots=True)
+class SpiralPoint:
+    """A single spiral coordinate that also reads like the dict it replaces."""
+    index: int
+    coords: list
+    strand: int
+    base: str
+    complement: str
+    angle: float
+    
+    # Dict keys, in the order the coordinate dicts used to have them
+    _KEYS: ClassVar[tuple] = ('index', 'coords', 'strand', 'base', 'complement', 'angle',
+                              'base_pair_id')
+    
+    @property
+    def base_pair_id(self):
+        return f"{self.base}-{self.complement}"
+    
+    def keys(self):
+        return self._KEYS
+    
+    def __iter__(self):
+        return iter(self._KEYS)
+    
+    def __len__(self):
+        return len(self._KEYS)
+    
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key):
+        return key in self._KEYS
+    
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._KEYS else default
+    
+    def to_dict(self):
+        """Plain dict copy, e.g. for JSON output."""
+        return {key: getattr(self, key) for key in self._KEYS}
+
+
+@dataclass(slots=True)
+class MainSpiralPoint(SpiralPoint):
+    """Spiral coordinate on the main process spiral."""
+    spiral_direction: int = 1
+    is_main_spiral: bool = True
+    
+    _KEYS: ClassVar[tuple] = ('index', 'coords', 'strand', 'base', 'complement', 'angle',
+                              'spiral_direction', 'base_pair_id', 'is_main_spiral')
+
+
+@dataclass
+class SpiralCoords:
+    """Struct-of-arrays spiral coordinates, one array per field."""
+    xs: np.ndarray
+    ys: np.ndarray
+    zs: np.ndarray
+    angles: np.ndarray
+    strands: np.ndarray
+    base_idx: int = 0  # Position in the base table of the first coordinate
+    
+    def __len__(self):
+        return len(self.xs)
+    
+    @classmethod
+    def from_dicts(cls, coordinates):
+        """Build arrays from a list of coordinate dicts or SpiralPoints."""
+        count = len(coordinates)
+        xyz = np.array([coord['coords'] for coord in coordinates], dtype=np.float64).reshape(count, 3)
+        angles = np.fromiter((coord['angle'] for coord in coordinates), dtype=np.float64, count=count)
+        # Fork coordinates use the 'fork' strand label, so keep whatever type the input has
+        strands = np.array([coord['strand'] for coord in coordinates])
+        base_idx = coordinates[0]['index'] if count else 0
+        return cls(xyz[:, 0], xyz[:, 1], xyz[:, 2], angles, strands, base_idx)
+    
+    def to_points(self, base_list, complement_list, point_type=SpiralPoint, **extra):
+        """Expand arrays into one SpiralPoint per coordinate."""
+        base_count = len(base_list)
+        coordinates = []
+        
+        for index, (x, y, z, strand, angle) in enumerate(zip(
+                self.xs.tolist(), self.ys.tolist(), self.zs.tolist(),
+                self.strands.tolist(), self.angles.tolist())):
+            base_index = (self.base_idx + index) % base_count
+            coordinates.append(point_type(self.base_idx + index, [x, y, z], strand, base_list[base_index],
+                                          complement_list[base_index], angle, **extra))
+        
+        return coordinates
+
+
 class DNASpiralGenerator:
     """Generates DNA-like spiral coordinates using base 44 structure with fork handling."""
     
@@ -10,74 +132,65 @@ class DNASpiralGenerator:
         self.pitch = pitch  # Vertical distance per full rotation
         self.fork_offset = fork_offset  # Distance offset for fork spirals
         self.base_pairs = self._generate_base_pairs()
+        self._base_list = tuple(self.base_pairs)
+        self._complement_list = tuple(self.base_pairs[b] for b in self._base_list)
         self.fork_spirals = {}  # Track active fork spirals
+        
+        # Spiral angles and strands repeat every `period` indices, so cos/sin are
+        # tabulated once per residue instead of evaluated once per process
+        period = self.base if self.base % 2 == 0 else 2 * self.base
+        residue = np.arange(period)
+        main_angles = (2 * np.pi / (self.base / 2)) * residue + (residue & 1) * np.pi
+        fork_angles = (2 * np.pi / (self.base / 4)) * residue
+        self._cos_main = np.cos(main_angles)
+        self._sin_main = np.sin(main_angles)
+        self._cos_fork = np.cos(fork_angles)
+        self._sin_fork = np.sin(fork_angles)
     
     def _generate_base_pairs(self):
         """Generate base 44 pairing system for DNA structure."""
-        # Create 44 unique base identifiers
-        bases = []
-        for i in range(self.base):
-            if i < 26:
-                bases.append(chr(ord('A') + i))  # A-Z
-            else:
-                bases.append(f"X{i-25}")  # X1-X18 for remaining bases
+        return dict(_base_pair_table(self.base))
+    
+    def _spiral_arrays(self, process_count, spiral_multiplier):
+        """Run the compiled spiral kernel into freshly allocated arrays."""
+        xs = np.empty(process_count, dtype=np.float64)
+        ys = np.empty(process_count, dtype=np.float64)
+        zs = np.empty(process_count, dtype=np.float64)
+        angles = np.empty(process_count, dtype=np.float64)
         
-        # Create complementary pairs
-        pairs = {}
-        for i in range(self.base // 2):
-            pairs[bases[i]] = bases[self.base - 1 - i]
-            pairs[bases[self.base - 1 - i]] = bases[i]
+        spiral_kernel(process_count, self.base, float(self.helix_radius), float(self.pitch),
+                      spiral_multiplier, self._cos_main, self._sin_main, xs, ys, zs, angles)
         
-        return pairs
+        strands = np.arange(process_count) & 1
+        return SpiralCoords(xs, ys, zs, angles, strands)
+    
+    def generate_spiral_arrays(self, process_count):
+        """Generate 3D spiral coordinates for processes as arrays."""
+        return self._spiral_arrays(process_count, 1)
     
     def generate_spiral_coordinates(self, process_count):
         """Generate 3D spiral coordinates for processes."""
-        coordinates = []
-        
-        for i in range(process_count):
-            # Calculate angle for spiral
-            angle = (2 * math.pi * i) / (self.base / 2)  # Two strands
-            
-            # Calculate height along spiral
-            height = (i * self.pitch) / (self.base / 2)
-            
-            # Determine which strand (0 or 1)
-            strand = i % 2
-            
-            # Calculate x, y coordinates for double helix
-            if strand == 0:
-                x = self.helix_radius * math.cos(angle)
-                y = self.helix_radius * math.sin(angle)
-            else:
-                x = self.helix_radius * math.cos(angle + math.pi)
-                y = self.helix_radius * math.sin(angle + math.pi)
-            
-            # Assign base pair
-            base_index = i % self.base
-            base = list(self.base_pairs.keys())[base_index]
-            complement = self.base_pairs[base]
-            
-            coordinates.append({
-                'index': i,
-                'coords': [x, y, height],
-                'strand': strand,
-                'base': base,
-                'complement': complement,
-                'angle': angle,
-                'base_pair_id': f"{base}-{complement}"
-            })
+        return self.generate_spiral_arrays(process_count).to_points(self._base_list, self._complement_list)
+    
+    def _coord_at(self, i):
+        """Compute the spiral coordinate for a single index."""
+        angle = (2 * math.pi / (self.base / 2)) * i
+        height = (i * self.pitch) / (self.base / 2)
+        strand = i & 1
+        residue = i % len(self._cos_main)
+        x = self.helix_radius * float(self._cos_main[residue])
+        y = self.helix_radius * float(self._sin_main[residue])
         
-        return coordinates
+        base_index = i % self.base
+        return SpiralPoint(i, [x, y, height], strand, self._base_list[base_index],
+                           self._complement_list[base_index], angle)
     
     def get_process_location(self, process_id, total_processes):
         """Get specific location for a process in the spiral."""
-        spiral_coords = self.generate_spiral_coordinates(total_processes)
-        
         # Convert process_id to index (e.g., A1 -> 0, A2 -> 1)
         if isinstance(process_id, str):
             # Extract number from process_id like A1, A2, etc.
-            import re
-            match = re.search(r'(\d+)', process_id)
+            match = _PROCESS_ID_RE.search(process_id)
             if match:
                 index = int(match.group(1)) - 1
             else:
@@ -85,27 +198,31 @@ class DNASpiralGenerator:
         else:
             index = process_id
         
-        if index < len(spiral_coords):
-            return spiral_coords[index]
+        if 0 <= index < total_processes:
+            return self._coord_at(index)
         return None
     
+    def generate_birds_eye_arrays(self, coordinates):
+        """Project spiral coordinates to 2D, returning one array per axis."""
+        if not isinstance(coordinates, SpiralCoords):
+            coordinates = SpiralCoords.from_dicts(coordinates)
+        
+        # Use height as radius modifier and angle to position in 2D circle
+        radius = self.helix_radius + coordinates.zs / 10
+        return {
+            'x_2d': radius * np.cos(coordinates.angles),
+            'y_2d': radius * np.sin(coordinates.angles)
+        }
+    
     def generate_birds_eye_view(self, coordinates):
         """Generate 2D bird's eye view coordinates from 3D spiral."""
-        birds_eye = []
+        projected = self.generate_birds_eye_arrays(coordinates)
         
-        for coord in coordinates:
-            # Project 3D coordinates to 2D using height as radius modifier
-            height_factor = coord['coords'][2] / 10  # Scale height influence
-            radius = self.helix_radius + height_factor
-            
-            # Use angle to position in 2D circle
-            angle = coord['angle']
-            x_2d = radius * math.cos(angle)
-            y_2d = radius * math.sin(angle)
-            
+        birds_eye = []
+        for coord, xi, yi in zip(coordinates, projected['x_2d'].tolist(), projected['y_2d'].tolist()):
             birds_eye.append({
                 'index': coord['index'],
-                'coords_2d': [x_2d, y_2d],
+                'coords_2d': [xi, yi],
                 'coords_3d': coord['coords'],
                 'base': coord['base'],
                 'strand': coord['strand']
@@ -146,94 +263,62 @@ class DNASpiralGenerator:
         start_y = main_process['coords'][1] + fork_y_offset
         start_height = main_process['coords'][2]
         
-        fork_coordinates = []
         branch_processes = fork_info['branches'][branch_index] if branch_index < len(fork_info['branches']) else []
+        count = len(branch_processes)
         
-        for i, process in enumerate(branch_processes):
-            # Fork spirals are smaller and tighter
-            fork_radius = self.helix_radius * 0.6
-            fork_pitch = self.pitch * 0.8
-            
-            # Calculate spiral for fork
-            angle = (2 * math.pi * i) / (self.base / 4)  # Tighter spiral
-            
-            # Fork direction: right on way down, left on way up
-            if i < len(branch_processes) / 2:  # Going down
-                spiral_direction = 1  # Right spiral
-            else:  # Going up (returning to main)
-                spiral_direction = -1  # Left spiral
-            
-            height = start_height + (i * fork_pitch) / (self.base / 4)
-            
-            x = start_x + fork_radius * math.cos(angle * spiral_direction)
-            y = start_y + fork_radius * math.sin(angle * spiral_direction)
-            
-            # Assign base pair for fork
-            base_index = i % self.base
-            base = list(self.base_pairs.keys())[base_index]
-            complement = self.base_pairs[base]
+        # Fork spirals are smaller and tighter
+        fork_radius = self.helix_radius * 0.6
+        fork_pitch = self.pitch * 0.8
+        
+        i = np.arange(count, dtype=np.float64)
+        angle = (2 * np.pi / (self.base / 4)) * i  # Tighter spiral
+        
+        # Fork direction: right on way down, left on way up (returning to main)
+        spiral_direction = np.where(i < count / 2, 1, -1)
+        
+        height = start_height + (i * fork_pitch) / (self.base / 4)
+        residue = np.arange(count) % len(self._cos_fork)
+        x = start_x + fork_radius * self._cos_fork[residue]
+        y = start_y + fork_radius * spiral_direction * self._sin_fork[residue]
+        
+        # Assign base pairs for fork
+        fork_coordinates = []
+        
+        for index, (process, xi, yi, zi, ai, di) in enumerate(zip(
+                branch_processes, x.tolist(), y.tolist(), height.tolist(),
+                angle.tolist(), spiral_direction.tolist())):
+            base_index = index % self.base
+            base = self._base_list[base_index]
+            complement = self._complement_list[base_index]
             
             fork_coordinates.append({
-                'index': i,
-                'process_id': process.get('id', f"fork_{fork_info['process_id']}_{i}"),
-                'coords': [x, y, height],
+                'index': index,
+                'process_id': process.get('id', f"fork_{fork_info['process_id']}_{index}"),
+                'coords': [xi, yi, zi],
                 'strand': 'fork',
                 'base': base,
                 'complement': complement,
-                'angle': angle,
+                'angle': ai,
                 'fork_parent': fork_info['process_id'],
                 'fork_type': fork_info['fork_type'],
                 'branch_index': branch_index,
-                'spiral_direction': spiral_direction
+                'spiral_direction': di
             })
         
         return fork_coordinates
     
+    def generate_main_spiral_arrays(self, process_count, direction='down'):
+        """Generate main spiral coordinates as arrays with proper up/down direction."""
+        # Main spiral: right on way down, left on way up
+        spiral_multiplier = 1 if direction == 'down' else -1
+        return self._spiral_arrays(process_count, spiral_multiplier)
+    
     def generate_main_spiral_coordinates(self, process_count, direction='down'):
         """Generate main spiral coordinates with proper up/down direction."""
-        coordinates = []
-        
-        for i in range(process_count):
-            # Main spiral: right on way down, left on way up
-            if direction == 'down':
-                spiral_multiplier = 1  # Right spiral going down
-                height = (i * self.pitch) / (self.base / 2)
-            else:  # direction == 'up'
-                spiral_multiplier = -1  # Left spiral going up
-                height = ((process_count - i) * self.pitch) / (self.base / 2)
-            
-            # Calculate angle for spiral
-            angle = (2 * math.pi * i * spiral_multiplier) / (self.base / 2)
-            
-            # Determine which strand (0 or 1)
-            strand = i % 2
-            
-            # Calculate x, y coordinates for double helix
-            if strand == 0:
-                x = self.helix_radius * math.cos(angle)
-                y = self.helix_radius * math.sin(angle)
-            else:
-                x = self.helix_radius * math.cos(angle + math.pi)
-                y = self.helix_radius * math.sin(angle + math.pi)
-            
-            # Assign base pair
-            base_index = i % self.base
-            base = list(self.base_pairs.keys())[base_index]
-            complement = self.base_pairs[base]
-            
-            coordinates.append({
-                'index': i,
-                'coords': [x, y, height],
-                'strand': strand,
-                'base': base,
-                'complement': complement,
-                'angle': angle,
-                'spiral_direction': spiral_multiplier,
-                'base_pair_id': f"{base}-{complement}",
-                'is_main_spiral': True
-            })
-        
-        return coordinates
+        spiral_multiplier = 1 if direction == 'down' else -1
+        arrays = self.generate_main_spiral_arrays(process_count, direction)
+        return arrays.to_points(self._base_list, self._complement_list, MainSpiralPoint,
+                                spiral_direction=spiral_multiplier)
     
     def generate_complete_spiral_system(self, code_structure):
         """Generate complete spiral system with main spiral and all forks."""
@@ -249,20 +334,26 @@ class DNASpiralGenerator:
         
         # Detect and generate fork spirals
         forks = self.detect_code_forks(code_structure)
-        all_coordinates = main_coords.copy()
+        fork_segments = []
         
         for fork in forks:
             if fork['process_id'] in main_coord_lookup:
                 # Generate coordinates for each branch of the fork
                 for branch_idx in range(len(fork['branches'])):
-                    fork_coords = self.generate_fork_spiral_coordinates(
+                    fork_segments.append(self.generate_fork_spiral_coordinates(
                         main_coord_lookup, fork, branch_idx
-                    )
-                    all_coordinates.extend(fork_coords)
+                    ))
+        
+        # Copy each branch into a list sized up front
+        fork_spirals = [None] * sum(len(segment) for segment in fork_segments)
+        cursor = 0
+        for segment in fork_segments:
+            fork_spirals[cursor:cursor + len(segment)] = segment
+            cursor += len(segment)
         
         return {
             'main_spiral': main_coords,
-            'fork_spirals': [coord for coord in all_coordinates if not coord.get('is_main_spiral', False)],
-            'all_coordinates': all_coordinates,
+            'fork_spirals': fork_spirals,
+            'all_coordinates': main_coords + fork_spirals,
             'fork_info': forks
         }
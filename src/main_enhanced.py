@@ -88,7 +88,7 @@ def main():
     
     return {
         'categorized_map': categorized_map,
-        'spiral_coordinates': spiral_coordinates,
+        'spiral_coordinates': [point.to_dict() for point in spiral_coordinates],
         'legend_data': legend_data,
         'dual_views': dual_views,
         'optimization_report': optimization_report
@@ -1,6 +1,23 @@
+import heapq
+import os
+import threading
 import time
-from collections import defaultdict, deque
-import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from graphlib import CycleError, TopologicalSorter
+
+@dataclass(slots=True)
+class CategoryStats:
+    """Execution totals for one process category."""
+    count: int = 0
+    avg_time: float = 0
+    total_time: float = 0
+    
+    def as_dict(self):
+        """Plain dict form used in reports."""
+        return {'count': self.count, 'avg_time': self.avg_time, 'total_time': self.total_time}
+
 
 class ExecutionOptimizer:
     """Optimizes code execution by avoiding redundant processes and direct routing."""
@@ -13,6 +30,28 @@ class ExecutionOptimizer:
         self.optimization_rules = {}
         self.energy_savings = 0
         self.time_savings = 0
+        self._io_pool = None  # created on the first parallel group, shut down by close()
+        self._expiry_heap = []  # (expiry, process) for cached results, on the monotonic clock
+        self._cache_lock = threading.Lock()
+        # Category totals and recommendations from the last report, rebuilt only
+        # after new metrics, changed rules or a rebuilt legend
+        self._metrics_dirty = True
+        self._scanned_locations = None
+        self._scanned_rules = None
+        self._cached_category_stats = {}
+        self._cached_recommendations = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Shut down the worker threads used for parallel groups."""
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
     
     def initialize_optimization_rules(self):
         """Initialize optimization rules for different process categories."""
@@ -60,6 +99,8 @@ class ExecutionOptimizer:
                 'parallel_safe': False
             }
         }
+        
+        self._metrics_dirty = True
     
     def optimize_execution_path(self, target_processes):
         """Optimize execution path for multiple target processes."""
@@ -75,14 +116,17 @@ class ExecutionOptimizer:
             'estimated_savings': {'time': 0, 'energy': 0}
         }
         
+        self._evict_expired()
+        
+        # Look up location data and rules once for the whole pass
+        meta = self._process_meta(target_processes)
+        
         # Analyze each process
         for process in target_processes:
-            process_data = self.location_legend.legend['locations'].get(process)
-            if not process_data:
+            if process not in meta:
                 continue
             
-            category = process_data['category']
-            rules = self.optimization_rules.get(category, {})
+            _, rules = meta[process]
             
             # Check if process can be skipped
             if self._can_skip_process(process, rules):
@@ -99,7 +143,7 @@ class ExecutionOptimizer:
         
         # Group parallel-safe processes
         optimization_plan['parallel_groups'] = self._identify_parallel_groups(
-            optimization_plan['optimized_path']
+            optimization_plan['optimized_path'], meta
         )
         
         # Calculate estimated savings
@@ -117,32 +161,81 @@ class ExecutionOptimizer:
             return False
         
         # Check cache expiration
-        cache_duration = rules.get('cache_duration', 0)
-        if cache_duration == 0:
-            return False
-        
-        age = time.time() - cached_data.get('timestamp', 0)
-        if age > cache_duration:
+        if time.monotonic() >= cached_data.get('expiry', 0):
             # Remove expired cache
             del self.execution_cache[process]
             return False
         
         return True
     
-    def _identify_parallel_groups(self, processes):
+    def _process_meta(self, processes):
+        """Map each known process to its (location data, optimization rules)."""
+        locations = self.location_legend.legend['locations']
+        meta = {}
+        
+        for process in processes:
+            process_data = locations.get(process)
+            if process_data:
+                category = process_data['category']
+                meta[process] = (process_data, self.optimization_rules.get(category, {}))
+        
+        return meta
+    
+    def _build_dependency_graph(self, processes, meta):
+        """Build a scheduler where each subprocess waits for its parent process."""
+        sorter = TopologicalSorter()
+        
+        for process in processes:
+            if process not in meta:
+                continue
+            sorter.add(process)
+            for subprocess in meta[process][0]['workflow_info']['subprocesses']:
+                if subprocess in meta:
+                    sorter.add(subprocess, process)
+        
+        return sorter
+    
+    def _identify_parallel_groups(self, processes, meta=None):
         """Identify processes that can be executed in parallel."""
+        if meta is None:
+            meta = self._process_meta(processes)
+        else:
+            planned = set(processes)
+            meta = {process: entry for process, entry in meta.items() if process in planned}
+        
+        sorter = self._build_dependency_graph(processes, meta)
+        try:
+            sorter.prepare()
+        except CycleError:
+            return self._group_in_order(processes, meta)
+        
+        parallel_groups = []
+        
+        # Each wave holds processes whose dependencies have all run; its
+        # parallel-safe members share one group, the rest run one at a time
+        while sorter.is_active():
+            ready = sorter.get_ready()
+            parallel, sequential = [], []
+            for process in ready:
+                (parallel if meta[process][1].get('parallel_safe', False) else sequential).append(process)
+            
+            if parallel:
+                parallel_groups.append(parallel)
+            parallel_groups.extend([process] for process in sequential)
+            sorter.done(*ready)
+        
+        return parallel_groups
+    
+    def _group_in_order(self, processes, meta):
+        """Group consecutive parallel-safe processes, keeping the given order."""
         parallel_groups = []
         current_group = []
         
         for process in processes:
-            process_data = self.location_legend.legend['locations'].get(process)
-            if not process_data:
+            if process not in meta:
                 continue
             
-            category = process_data['category']
-            rules = self.optimization_rules.get(category, {})
-            
-            if rules.get('parallel_safe', False):
+            if meta[process][1].get('parallel_safe', False):
                 current_group.append(process)
             else:
                 # End current parallel group
@@ -200,18 +293,25 @@ class ExecutionOptimizer:
         for cached_process, cached_result in optimization_plan['cached_results'].items():
             execution_results['results'][cached_process] = cached_result['result']
         
-        # Execute parallel groups
-        for group in optimization_plan['parallel_groups']:
-            if len(group) == 1:
-                # Single process execution
-                result = self._execute_single_process(group[0])
-                execution_results['results'][group[0]] = result
-                execution_results['performance']['processes_executed'] += 1
-            else:
-                # Parallel execution (simulated)
-                parallel_results = self._execute_parallel_group(group)
-                execution_results['results'].update(parallel_results)
-                execution_results['performance']['processes_executed'] += len(group)
+        # A re-run plan whose processes have all been cached since it was made
+        # would only reproduce those results
+        reusable_results = self._reusable_results(optimization_plan)
+        if reusable_results is not None:
+            execution_results['results'].update(reusable_results)
+            execution_results['performance']['processes_skipped'] += len(reusable_results)
+        else:
+            # Execute parallel groups
+            for group in optimization_plan['parallel_groups']:
+                if len(group) == 1:
+                    # Single process execution
+                    result = self._execute_single_process(group[0])
+                    execution_results['results'][group[0]] = result
+                    execution_results['performance']['processes_executed'] += 1
+                else:
+                    # Parallel execution
+                    parallel_results = self._execute_parallel_group(group)
+                    execution_results['results'].update(parallel_results)
+                    execution_results['performance']['processes_executed'] += len(group)
         
         execution_results['performance']['end_time'] = time.time()
         execution_results['performance']['total_time'] = (
@@ -224,6 +324,20 @@ class ExecutionOptimizer:
         
         return execution_results
     
+    def _reusable_results(self, optimization_plan):
+        """Cached results for every process the plan executes, or None if any must run again."""
+        meta = self._process_meta(optimization_plan['optimized_path'])
+        now = time.monotonic()
+        results = {}
+        for process in optimization_plan['optimized_path']:
+            if process not in meta or not meta[process][1].get('skip_if_unchanged', False):
+                return None
+            cached_data = self.execution_cache.get(process)
+            if cached_data is None or cached_data['expiry'] <= now:
+                return None
+            results[process] = cached_data['result']
+        return results
+    
     def _execute_single_process(self, process):
         """Execute a single process and cache result."""
         start_time = time.time()
@@ -243,28 +357,42 @@ class ExecutionOptimizer:
         
         # Cache the result
         category = process_data.get('category', 'general')
-        rules = self.optimization_rules.get(category, {})
-        if rules.get('cache_duration', 0) > 0:
-            self.execution_cache[process] = {
-                'result': result,
-                'timestamp': time.time(),
-                'coordinates': process_data.get('coordinates_3d', [0, 0, 0])
-            }
+        cache_duration = self.optimization_rules.get(category, {}).get('cache_duration', 0)
+        if cache_duration > 0:
+            expiry = time.monotonic() + cache_duration
+            with self._cache_lock:
+                self.execution_cache[process] = {
+                    'result': result,
+                    'expiry': expiry,
+                    'wall_timestamp': time.time(),  # For reporting only
+                    'coordinates': process_data.get('coordinates_3d', [0, 0, 0])
+                }
+                heapq.heappush(self._expiry_heap, (expiry, process))
         
         return result
     
+    def _evict_expired(self):
+        """Drop cached results whose cache duration has passed."""
+        now = time.monotonic()
+        with self._cache_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expiry, process = heapq.heappop(self._expiry_heap)
+                # Skip entries that were refreshed after this one was queued
+                cached_data = self.execution_cache.get(process)
+                if cached_data and cached_data['expiry'] == expiry:
+                    del self.execution_cache[process]
+    
     def _execute_parallel_group(self, group):
-        """Execute a group of processes in parallel (simulated)."""
-        results = {}
-        
-        # In a real implementation, this would use threading or multiprocessing
-        for process in group:
-            results[process] = self._execute_single_process(process)
-        
-        return results
+        """Execute a group of processes in parallel."""
+        # Worker threads share execution_cache, so results cached by one
+        # process are visible to the rest of the plan
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+        return dict(zip(group, self._io_pool.map(self._execute_single_process, group)))
     
     def _update_performance_metrics(self, execution_results):
         """Update performance metrics based on execution results."""
+        self._metrics_dirty = True
         for process, result in execution_results['results'].items():
             if process not in self.performance_metrics:
                 self.performance_metrics[process] = {
@@ -283,6 +411,8 @@ class ExecutionOptimizer:
     
     def get_optimization_report(self):
         """Generate optimization performance report."""
+        self._evict_expired()
+        
         total_processes = len(self.performance_metrics)
         total_executions = sum(m['execution_count'] for m in self.performance_metrics.values())
         cached_hits = len(self.execution_cache)
@@ -301,43 +431,64 @@ class ExecutionOptimizer:
             'recommendations': []
         }
         
-        # Analyze performance by category
-        category_stats = defaultdict(lambda: {'count': 0, 'avg_time': 0, 'total_time': 0})
+        locations = self.location_legend.legend['locations']
+        # Recommendations read these rule values, which may be edited in place
+        rules = tuple(
+            (category, category_rules.get('cache_duration', 0), category_rules.get('parallel_safe', False))
+            for category, category_rules in self.optimization_rules.items()
+        )
+        if self._metrics_dirty or locations is not self._scanned_locations or rules != self._scanned_rules:
+            self._cached_category_stats = self._analyze_category_performance(locations)
+            self._cached_recommendations = self._generate_optimization_recommendations()
+            self._scanned_locations = locations
+            self._scanned_rules = rules
+            self._metrics_dirty = False
+        
+        for category, stats in self._cached_category_stats.items():
+            report['category_performance'][category] = stats.as_dict()
+        report['recommendations'] = [dict(recommendation) for recommendation in self._cached_recommendations]
+        
+        return report
+    
+    def _analyze_category_performance(self, locations):
+        """Total execution counts and times per category."""
+        category_stats = {}
         
         for process, metrics in self.performance_metrics.items():
-            process_data = self.location_legend.legend['locations'].get(process, {})
+            process_data = locations.get(process, {})
             category = process_data.get('category', 'general')
             
-            category_stats[category]['count'] += metrics['execution_count']
-            category_stats[category]['total_time'] += metrics['total_time']
-        
-        for category, stats in category_stats.items():
-            if stats['count'] > 0:
-                stats['avg_time'] = stats['total_time'] / stats['count']
-            report['category_performance'][category] = stats
+            stats = category_stats.get(category)
+            if stats is None:
+                stats = category_stats[category] = CategoryStats()
+            stats.count += metrics['execution_count']
+            stats.total_time += metrics['total_time']
         
-        # Generate recommendations
-        report['recommendations'] = self._generate_optimization_recommendations()
+        for stats in category_stats.values():
+            if stats.count > 0:
+                stats.avg_time = stats.total_time / stats.count
         
-        return report
+        return category_stats
     
     def _generate_optimization_recommendations(self):
         """Generate optimization recommendations based on performance data."""
         recommendations = []
+        locations = self.location_legend.legend['locations']
         
         # Identify frequently executed processes that could benefit from longer caching
         for process, metrics in self.performance_metrics.items():
             if metrics['execution_count'] > 10 and metrics['avg_execution_time'] > 1.0:
-                process_data = self.location_legend.legend['locations'].get(process, {})
+                process_data = locations.get(process, {})
                 category = process_data.get('category', 'general')
+                cache_duration = self.optimization_rules.get(category, {}).get('cache_duration', 0)
                 
                 recommendations.append({
                     'type': 'increase_cache_duration',
                     'process': process,
                     'category': category,
                     'reason': f"Frequently executed ({metrics['execution_count']} times) with high execution time",
-                    'current_cache_duration': self.optimization_rules.get(category, {}).get('cache_duration', 0),
-                    'suggested_cache_duration': min(1800, self.optimization_rules.get(category, {}).get('cache_duration', 0) * 2)
+                    'current_cache_duration': cache_duration,
+                    'suggested_cache_duration': min(1800, cache_duration * 2)
                 })
         
         # Identify processes that could be parallelized
@@ -345,7 +496,7 @@ class ExecutionOptimizer:
                                if not rules.get('parallel_safe', False)]
         
         for category in sequential_categories:
-            category_processes = [p for p, data in self.location_legend.legend['locations'].items() 
+            category_processes = [p for p, data in locations.items() 
                                 if data.get('category') == category]
             
             if len(category_processes) > 3:
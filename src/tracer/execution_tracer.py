@@ -2,28 +2,121 @@
 import sys
 from collections import defaultdict
 
+import numpy as np
+
+_INITIAL_EVENTS = 1024
+
 class ExecutionTracer:
     def __init__(self):
         self.execution_map = defaultdict(list)
         self.current_coords = [0, 0, 0]  # x, y, z for 3D map
+        # Only x advances while tracing; current_coords catches up when the map is built
+        self._x = 0
+        # Traced events, struct-of-arrays; execution_map is built from these
+        self._xs = np.empty(_INITIAL_EVENTS, dtype=np.int32)
+        self._lines = np.empty(_INITIAL_EVENTS, dtype=np.int32)
+        self._files = []
+        self._n = 0
+        self._traced_code = []
 
     def trace(self, frame, event, arg):
         """Trace execution and assign 3D coordinates."""
         if event == "line":
-            code = frame.f_code
-            line_no = frame.f_lineno
-            address = f"A{line_no}"  # Simplified address for now
-            self.current_coords[0] += 2  # Move along x-axis for sequential lines
-            self.execution_map[address].append({
-                'file': code.co_filename,
+            self._record_line(frame.f_code, frame.f_lineno)
+        return self.trace
+
+    def _on_start(self, code, instruction_offset):
+        """sys.monitoring PY_START callback: turn on line events for newly entered code."""
+        monitoring = sys.monitoring
+        monitoring.set_local_events(monitoring.COVERAGE_ID, code, monitoring.events.LINE)
+        self._traced_code.append(code)
+        return monitoring.DISABLE
+
+    def _on_line(self, code, line_no):
+        """sys.monitoring LINE callback."""
+        self._record_line(code, line_no)
+
+    def _record_line(self, code, line_no):
+        """Assign 3D coordinates to an executed line."""
+        n = self._n
+        if n >= len(self._lines):
+            self._grow()
+        self._x += 2  # Move along x-axis for sequential lines
+        self._xs[n] = self._x
+        self._lines[n] = line_no
+        self._files.append(code.co_filename)
+        self._n = n + 1
+
+    def _grow(self):
+        """Double the capacity of the event arrays."""
+        capacity = 2 * len(self._lines)
+        xs = np.empty(capacity, dtype=np.int32)
+        xs[:self._n] = self._xs[:self._n]
+        lines = np.empty(capacity, dtype=np.int32)
+        lines[:self._n] = self._lines[:self._n]
+        self._xs, self._lines = xs, lines
+
+    def _build_execution_map(self):
+        """Group traced events by line address."""
+        self.current_coords[0] = self._x
+        _, y, z = self.current_coords
+        
+        execution_map = defaultdict(list)
+        xs = self._xs[:self._n].tolist()
+        lines = self._lines[:self._n].tolist()
+        for line_no, file, x in zip(lines, self._files, xs):
+            execution_map[f"A{line_no}"].append({  # Simplified address for now
+                'file': file,
                 'code': f"Line {line_no}",  # Placeholder; integrate with parser later
-                'coords': self.current_coords.copy()
+                'coords': [x, y, z]
             })
-        return self.trace
+        self.execution_map = execution_map
+        return execution_map
 
     def start_tracing(self, func):
         """Start tracing a function's execution."""
+        self._x = self.current_coords[0]
+        monitoring = getattr(sys, 'monitoring', None)
+        if monitoring is None:
+            self._trace_with_settrace(func)
+            return self._build_execution_map()
+
+        try:
+            monitoring.use_tool_id(monitoring.COVERAGE_ID, "codemap")
+        except ValueError:
+            # Another coverage tool owns the slot
+            self._trace_with_settrace(func)
+            return self._build_execution_map()
+
+        try:
+            self._trace_with_monitoring(monitoring, func)
+        finally:
+            monitoring.free_tool_id(monitoring.COVERAGE_ID)
+        return self._build_execution_map()
+
+    def _trace_with_settrace(self, func):
         sys.settrace(self.trace)
-        func()
-        sys.settrace(None)
-        return self.execution_map
+        try:
+            func()
+        finally:
+            sys.settrace(None)
+
+    def _trace_with_monitoring(self, monitoring, func):
+        """Trace every frame entered during func with LINE events (Python 3.12+)."""
+        tool_id = monitoring.COVERAGE_ID
+        events = monitoring.events
+        self._traced_code = []
+
+        monitoring.register_callback(tool_id, events.PY_START, self._on_start)
+        monitoring.register_callback(tool_id, events.LINE, self._on_line)
+        monitoring.set_events(tool_id, events.PY_START)
+        try:
+            func()
+        finally:
+            monitoring.set_events(tool_id, events.NO_EVENTS)
+            for code in self._traced_code:
+                monitoring.set_local_events(tool_id, code, events.NO_EVENTS)
+            monitoring.register_callback(tool_id, events.PY_START, None)
+            monitoring.register_callback(tool_id, events.LINE, None)
+            monitoring.restart_events()
+            self._traced_code = []
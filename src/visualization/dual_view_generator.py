@@ -1,5 +1,80 @@
+import functools
 import json
 import math
+import mmap
+import struct
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from categorization.process_categorizer import CATEGORY_ID, GENERAL_ID
+
+# Combined view file: magic, section count, then per section
+# (name length, name, offset, length) ahead of the concatenated JSON bodies
+_DUAL_MAGIC = b'CMDV'
+_DUAL_HEADER = struct.Struct('<4sI')
+_DUAL_NAME_LEN = struct.Struct('<I')
+_DUAL_SPAN = struct.Struct('<QQ')
+_DUAL_SECTIONS = ('spiral_3d', 'birds_eye_2d', 'synchronization')
+
+# Indexed by CATEGORY_ID
+_CATEGORY_SYMBOLS = ('◆', '●', '▲', '■', '★', '◇', '▼', '⚠', '○')
+
+
+def _category_symbol(category):
+    """Symbol representation for a category in the 2D view."""
+    return _CATEGORY_SYMBOLS[CATEGORY_ID.get(category, GENERAL_ID)]
+
+
+@functools.lru_cache(maxsize=128)
+def _node_size(category, subprocess_count):
+    """Node size for a category and number of subprocesses."""
+    base_size = 1.0
+    
+    # Increase size based on subprocesses
+    size_multiplier = 1.0 + (subprocess_count * 0.2)
+    
+    # Increase size for critical categories
+    if category in ('computation', 'crypto'):
+        size_multiplier *= 1.3
+    elif category in ('control', 'error'):
+        size_multiplier *= 1.1
+    
+    return base_size * size_multiplier
+
+
+def _dumps(payload):
+    """Serialize payload to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload).encode()
+
+
+def load_dual_views(path):
+    """Load the views written to a combined dual.bin file by save_dual_views."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, section_count = _DUAL_HEADER.unpack_from(mm, 0)
+        if magic != _DUAL_MAGIC:
+            raise ValueError(f"{path} is not a combined dual view file")
+        
+        pos = _DUAL_HEADER.size
+        views = {}
+        for _ in range(section_count):
+            (name_len,) = _DUAL_NAME_LEN.unpack_from(mm, pos)
+            pos += _DUAL_NAME_LEN.size
+            name = mm[pos:pos + name_len].decode()
+            pos += name_len
+            offset, length = _DUAL_SPAN.unpack_from(mm, pos)
+            pos += _DUAL_SPAN.size
+            body = mm[offset:offset + length]
+            views[name] = orjson.loads(body) if orjson is not None else json.loads(body)
+        
+        return views
+
 
 class DualViewGenerator:
     """Generates both 3D spiral and 2D bird's eye view visualizations."""
@@ -37,12 +112,18 @@ class DualViewGenerator:
             'connections': [],
             'strands': {'strand_0': [], 'strand_1': []},
             'base_pairs': [],
+            'styles': [],
             'camera': self.view_configs['3d_spiral']
         }
         
         # Create nodes for each process
+        styles = {}
+        nodes_by_id = {}
+        pending_edges = []
+        addresses = list(categorized_map)
+        addr_len = len(addresses)
         for i, coord_data in enumerate(spiral_coordinates):
-            address = list(categorized_map.keys())[i] if i < len(categorized_map) else f"P{i}"
+            address = addresses[i] if i < addr_len else f"P{i}"
             process_data = categorized_map.get(address, {})
             
             node = {
@@ -53,46 +134,50 @@ class DualViewGenerator:
                 'complement': coord_data['complement'],
                 'category': process_data.get('category', 'general'),
                 'command': process_data.get('command', ''),
-                'color': self.location_legend._get_category_color(process_data.get('category', 'general')),
-                'size': self._calculate_node_size(process_data),
+                'style_id': self._intern_style(styles, process_data),
                 'connections': process_data.get('subprocesses', [])
             }
             
             spiral_view['nodes'].append(node)
             spiral_view['strands'][f'strand_{coord_data["strand"]}'].append(node)
+            nodes_by_id.setdefault(address, node)
+            pending_edges.extend((address, connection) for connection in node['connections'])
+        spiral_view['styles'] = list(styles.values())
         
-        # Create base pair connections
-        for i in range(0, len(spiral_coordinates) - 1, 2):
-            if i + 1 < len(spiral_coordinates):
-                base_pair = {
-                    'node1': spiral_view['nodes'][i]['id'],
-                    'node2': spiral_view['nodes'][i + 1]['id'],
-                    'position1': spiral_coordinates[i]['coords'],
-                    'position2': spiral_coordinates[i + 1]['coords'],
-                    'base_pair_id': spiral_coordinates[i]['base_pair_id']
-                }
-                spiral_view['base_pairs'].append(base_pair)
+        # Create base pair connections between consecutive nodes
+        nodes = spiral_view['nodes']
+        node_pairs = zip(nodes[::2], nodes[1::2])
+        coord_pairs = zip(spiral_coordinates[::2], spiral_coordinates[1::2])
+        for (node1, node2), (coord1, coord2) in zip(node_pairs, coord_pairs):
+            spiral_view['base_pairs'].append({
+                'node1': node1['id'],
+                'node2': node2['id'],
+                'position1': coord1['coords'],
+                'position2': coord2['coords'],
+                'base_pair_id': coord1['base_pair_id']
+            })
         
         # Create process connections
-        for node in spiral_view['nodes']:
-            for connection in node['connections']:
-                if any(n['id'] == connection for n in spiral_view['nodes']):
-                    spiral_view['connections'].append({
-                        'from': node['id'],
-                        'to': connection,
-                        'type': 'subprocess'
-                    })
+        for source, connection in pending_edges:
+            if connection in nodes_by_id:
+                spiral_view['connections'].append({
+                    'from': source,
+                    'to': connection,
+                    'type': 'subprocess'
+                })
         
         return spiral_view
     
     def generate_2d_birds_eye_view(self, categorized_map, spiral_coordinates):
         """Generate 2D bird's eye view visualization data."""
-        birds_eye_coords = self.spiral_generator.generate_birds_eye_view(spiral_coordinates)
+        projected = self.spiral_generator.generate_birds_eye_arrays(spiral_coordinates)
+        xs, ys = projected['x_2d'], projected['y_2d']
+        node_count = len(xs)
         
         birds_eye_view = {
             'metadata': {
                 'view_type': '2d_birds_eye',
-                'total_nodes': len(birds_eye_coords),
+                'total_nodes': node_count,
                 'center': self.view_configs['2d_birds_eye']['center'],
                 'zoom_level': self.view_configs['2d_birds_eye']['zoom_level']
             },
@@ -100,6 +185,7 @@ class DualViewGenerator:
             'categories': {},
             'clusters': {},
             'flow_arrows': [],
+            'styles': [],
             'legend': {
                 'categories': {},
                 'symbols': {}
@@ -107,99 +193,107 @@ class DualViewGenerator:
         }
         
         # Create 2D nodes
-        category_positions = {}
-        for i, coord_2d in enumerate(birds_eye_coords):
-            address = list(categorized_map.keys())[i] if i < len(categorized_map) else f"P{i}"
+        category_nodes = {}  # category -> (label, node ids), labels in order of first appearance
+        labels = np.empty(node_count, dtype=np.intp)
+        styles = {}
+        birds_eye_by_id = {}
+        pending_edges = []
+        addresses = list(categorized_map)
+        addr_len = len(addresses)
+        for i, (coord_data, x_2d, y_2d) in enumerate(zip(spiral_coordinates, xs.tolist(), ys.tolist())):
+            address = addresses[i] if i < addr_len else f"P{i}"
             process_data = categorized_map.get(address, {})
             category = process_data.get('category', 'general')
             
             node = {
                 'id': address,
-                'position_2d': coord_2d['coords_2d'],
-                'position_3d': coord_2d['coords_3d'],
+                'position_2d': [x_2d, y_2d],
+                'position_3d': coord_data['coords'],
                 'category': category,
                 'command': process_data.get('command', ''),
-                'color': self.location_legend._get_category_color(category),
-                'size': self._calculate_node_size(process_data),
-                'symbol': self._get_category_symbol(category),
+                'style_id': self._intern_style(styles, process_data),
                 'connections': process_data.get('subprocesses', [])
             }
             
             birds_eye_view['nodes'].append(node)
+            birds_eye_by_id.setdefault(address, node)
+            pending_edges.extend((node, connection) for connection in node['connections'])
             
-            # Group by category for clustering
-            if category not in category_positions:
-                category_positions[category] = []
-            category_positions[category].append(node)
+            # Label by category for clustering
+            entry = category_nodes.get(category)
+            if entry is None:
+                entry = category_nodes[category] = (len(category_nodes), [])
+            labels[i] = entry[0]
+            entry[1].append(address)
         
-        # Create category clusters
-        for category, nodes in category_positions.items():
-            if len(nodes) > 1:
-                # Calculate cluster center
-                center_x = sum(node['position_2d'][0] for node in nodes) / len(nodes)
-                center_y = sum(node['position_2d'][1] for node in nodes) / len(nodes)
-                
-                birds_eye_view['clusters'][category] = {
-                    'center': [center_x, center_y],
-                    'nodes': [node['id'] for node in nodes],
-                    'color': self.location_legend._get_category_color(category),
-                    'count': len(nodes)
-                }
+        birds_eye_view['styles'] = list(styles.values())
         
-        # Create flow arrows between connected processes
-        for node in birds_eye_view['nodes']:
-            for connection in node['connections']:
-                target_node = next((n for n in birds_eye_view['nodes'] if n['id'] == connection), None)
-                if target_node:
-                    birds_eye_view['flow_arrows'].append({
-                        'from': node['position_2d'],
-                        'to': target_node['position_2d'],
-                        'from_id': node['id'],
-                        'to_id': target_node['id'],
-                        'category': node['category']
-                    })
+        # Cluster centers: per-category coordinate sums in one vectorized pass
+        counts = np.bincount(labels, minlength=len(category_nodes))
+        centers_x = (np.bincount(labels, weights=xs, minlength=len(counts)) / counts).tolist()
+        centers_y = (np.bincount(labels, weights=ys, minlength=len(counts)) / counts).tolist()
         
-        # Create legend
-        for category in category_positions.keys():
+        # Create category clusters and legend
+        for category, (label, node_ids) in category_nodes.items():
+            count = len(node_ids)
+            color = self.location_legend._get_category_color(category)
+            if count > 1:
+                birds_eye_view['clusters'][category] = {
+                    'center': [centers_x[label], centers_y[label]],
+                    'nodes': node_ids,
+                    'color': color,
+                    'count': count
+                }
             birds_eye_view['legend']['categories'][category] = {
-                'color': self.location_legend._get_category_color(category),
+                'color': color,
                 'symbol': self._get_category_symbol(category),
-                'count': len(category_positions[category])
+                'count': count
             }
         
+        # Create flow arrows between connected processes
+        for node, connection in pending_edges:
+            target_node = birds_eye_by_id.get(connection)
+            if target_node:
+                birds_eye_view['flow_arrows'].append({
+                    'from': node['position_2d'],
+                    'to': target_node['position_2d'],
+                    'from_id': node['id'],
+                    'to_id': target_node['id'],
+                    'category': node['category']
+                })
+        
         return birds_eye_view
     
+    def _index_nodes(self, nodes):
+        """Index nodes by id, keeping the first node for any repeated id."""
+        index = {}
+        for node in nodes:
+            index.setdefault(node['id'], node)
+        return index
+    
+    def _intern_style(self, styles, process_data):
+        """Return the id of the shared style entry for a node, adding it on first use."""
+        category = process_data.get('category', 'general')
+        key = (category, len(process_data.get('subprocesses', [])))
+        style = styles.get(key)
+        if style is None:
+            style = styles[key] = {
+                'id': len(styles),
+                'category': category,
+                'color': self.location_legend._get_category_color(category),
+                'size': self._calculate_node_size(process_data),
+                'symbol': self._get_category_symbol(category)
+            }
+        return style['id']
+    
     def _calculate_node_size(self, process_data):
         """Calculate node size based on process complexity."""
-        base_size = 1.0
-        
-        # Increase size based on subprocesses
-        subprocess_count = len(process_data.get('subprocesses', []))
-        size_multiplier = 1.0 + (subprocess_count * 0.2)
-        
-        # Increase size for critical categories
-        category = process_data.get('category', 'general')
-        if category in ['computation', 'crypto']:
-            size_multiplier *= 1.3
-        elif category in ['control', 'error']:
-            size_multiplier *= 1.1
-        
-        return base_size * size_multiplier
+        return _node_size(process_data.get('category', 'general'),
+                          len(process_data.get('subprocesses', [])))
     
     def _get_category_symbol(self, category):
         """Get symbol representation for category in 2D view."""
-        symbols = {
-            'data': '◆',
-            'computation': '●',
-            'io': '▲',
-            'control': '■',
-            'crypto': '★',
-            'network': '◇',
-            'ui': '▼',
-            'error': '⚠',
-            'general': '○'
-        }
-        return symbols.get(category, '○')
+        return _category_symbol(category)
     
     def generate_synchronized_views(self, categorized_map, spiral_coordinates):
         """Generate both views with synchronized data for seamless switching."""
@@ -210,12 +304,13 @@ class DualViewGenerator:
         sync_data = {
             'node_mapping': {},
             'category_mapping': {},
-            'view_transitions': {}
+            'transitions': {}
         }
         
         # Map nodes between views
+        birds_eye_by_id = self._index_nodes(birds_eye_2d['nodes'])
         for node_3d in spiral_3d['nodes']:
-            node_2d = next((n for n in birds_eye_2d['nodes'] if n['id'] == node_3d['id']), None)
+            node_2d = birds_eye_by_id.get(node_3d['id'])
             if node_2d:
                 sync_data['node_mapping'][node_3d['id']] = {
                     'position_3d': node_3d['position'],
@@ -223,20 +318,18 @@ class DualViewGenerator:
                     'category': node_3d['category']
                 }
         
-        # Create view transition animations
-        for node_id, mapping in sync_data['node_mapping'].items():
-            sync_data['view_transitions'][node_id] = {
-                'from_3d_to_2d': {
-                    'start': mapping['position_3d'],
-                    'end': mapping['position_2d'] + [0],  # Add z=0 for 2D
-                    'duration': 1000  # milliseconds
-                },
-                'from_2d_to_3d': {
-                    'start': mapping['position_2d'] + [0],
-                    'end': mapping['position_3d'],
-                    'duration': 1000
-                }
-            }
+        # Create view transition animations: one row per mapped node, played
+        # 3D -> 2D (positions_3d to positions_2d) or in reverse
+        node_mapping = sync_data['node_mapping']
+        positions_2d = np.zeros((len(node_mapping), 3))  # z=0 for 2D
+        if node_mapping:
+            positions_2d[:, :2] = [mapping['position_2d'] for mapping in node_mapping.values()]
+        sync_data['transitions'] = {
+            'ids': list(node_mapping),
+            'positions_3d': [mapping['position_3d'] for mapping in node_mapping.values()],
+            'positions_2d': positions_2d.tolist(),
+            'duration_ms': 1000
+        }
         
         return {
             'spiral_3d': spiral_3d,
@@ -244,19 +337,52 @@ class DualViewGenerator:
             'synchronization': sync_data
         }
     
-    def save_dual_views(self, dual_view_data, output_dir):
-        """Save both views and synchronization data."""
+    def save_dual_views(self, dual_view_data, output_dir, split_files=False):
+        """Save both views and synchronization data.
+        
+        Writes a single dual.bin (see load_dual_views); split_files=True writes
+        the three indented JSON files instead.
+        """
         import os
         os.makedirs(output_dir, exist_ok=True)
         
+        if not split_files:
+            self._write_combined(f"{output_dir}/dual.bin", dual_view_data)
+            return
+        
         # Save 3D spiral view
-        with open(f"{output_dir}/spiral_3d_view.json", 'w') as f:
-            json.dump(dual_view_data['spiral_3d'], f, indent=2)
+        self._write_json(f"{output_dir}/spiral_3d_view.json", dual_view_data['spiral_3d'])
         
         # Save 2D bird's eye view
-        with open(f"{output_dir}/birds_eye_2d_view.json", 'w') as f:
-            json.dump(dual_view_data['birds_eye_2d'], f, indent=2)
+        self._write_json(f"{output_dir}/birds_eye_2d_view.json", dual_view_data['birds_eye_2d'])
         
         # Save synchronization data
-        with open(f"{output_dir}/view_synchronization.json", 'w') as f:
-            json.dump(dual_view_data['synchronization'], f, indent=2)
+        self._write_json(f"{output_dir}/view_synchronization.json", dual_view_data['synchronization'])
+    
+    def _write_combined(self, path, dual_view_data):
+        """Write every view section into one file behind an offset table."""
+        names = [name.encode() for name in _DUAL_SECTIONS]
+        bodies = [_dumps(dual_view_data[name]) for name in _DUAL_SECTIONS]
+        
+        header_size = _DUAL_HEADER.size + sum(
+            _DUAL_NAME_LEN.size + len(name) + _DUAL_SPAN.size for name in names
+        )
+        header = [_DUAL_HEADER.pack(_DUAL_MAGIC, len(names))]
+        offset = header_size
+        for name, body in zip(names, bodies):
+            header.append(_DUAL_NAME_LEN.pack(len(name)))
+            header.append(name)
+            header.append(_DUAL_SPAN.pack(offset, len(body)))
+            offset += len(body)
+        
+        with open(path, 'wb') as f:
+            f.write(b''.join(header + bodies))
+    
+    def _write_json(self, path, payload):
+        """Write payload as indented JSON, through orjson when it is installed."""
+        if orjson is not None:
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(path, 'w') as f:
+                json.dump(payload, f, indent=2)
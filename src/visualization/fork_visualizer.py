@@ -1,6 +1,20 @@
+import os
+
+import matplotlib
+if os.environ.get('CODEMAP_BATCH') == '1':
+    # Image-only runs skip the interactive backend's GUI setup
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+try:
+    from vispy import scene
+except ImportError:
+    scene = None
 
 class ForkVisualizer:
     """Visualizes code forks in 3D spiral system."""
@@ -15,65 +29,121 @@ class ForkVisualizer:
             'function_call': '#96ceb4',
             'try': '#ffeaa7'
         }
+        # Parsed once so drawing never re-parses hex strings
+        self._rgba = {name: to_rgba(color) for name, color in self.colors.items()}
+        self._default_rgba = to_rgba('#888888')
+        # Small integer codes for fork types; unknown types get the next free code
+        self._type_codes = {name: code for code, name in enumerate(self.colors)}
+        # Figures are created on first use and redrawn in place while they stay open
+        self._fig3d = None
+        self._ax3d = None
+        self._fig2d = None
+        self._ax2d = None
+    
+    def _axes_3d(self):
+        """Return the reusable 3D figure and axes, cleared for a new drawing."""
+        if self._fig3d is None or not plt.fignum_exists(self._fig3d.number):
+            self._fig3d = plt.figure(figsize=(15, 10))
+            self._ax3d = self._fig3d.add_subplot(111, projection='3d')
+        else:
+            self._ax3d.clear()
+        return self._fig3d, self._ax3d
+    
+    def _axes_2d(self):
+        """Return the reusable 2D figure and axes, cleared for a new drawing."""
+        if self._fig2d is None or not plt.fignum_exists(self._fig2d.number):
+            self._fig2d, self._ax2d = plt.subplots(figsize=(12, 12))
+        else:
+            self._ax2d.clear()
+        return self._fig2d, self._ax2d
+    
+    def _coord_array(self, coords):
+        """Stack the coordinates of a list of points into one (N, 3) array."""
+        return np.array([coord['coords'] for coord in coords], dtype=np.float64).reshape(-1, 3)
+    
+    def _group_forks(self, fork_coords):
+        """Group fork coordinates by (parent, fork type, branch) as (first coord, xyz) pairs.
+        
+        Groups come back in order of first appearance, each with its points in input order.
+        """
+        n = len(fork_coords)
+        if not n:
+            return []
+        
+        parent_codes = {}
+        type_codes = self._type_codes
+        parents = np.fromiter((parent_codes.setdefault(coord['fork_parent'], len(parent_codes))
+                               for coord in fork_coords), dtype=np.int32, count=n)
+        types = np.fromiter((type_codes.setdefault(coord['fork_type'], len(type_codes))
+                             for coord in fork_coords), dtype=np.int16, count=n)
+        branches = np.fromiter((coord['branch_index'] for coord in fork_coords), dtype=np.int32, count=n)
+        
+        # Stable sort by the composite key, then split where any key column changes
+        order = np.lexsort((branches, types, parents))
+        parents, types, branches = parents[order], types[order], branches[order]
+        changed = (parents[1:] != parents[:-1]) | (types[1:] != types[:-1]) | (branches[1:] != branches[:-1])
+        starts = np.flatnonzero(np.r_[True, changed])
+        ends = np.r_[starts[1:], n]
+        xyz = self._coord_array(fork_coords)[order]
+        
+        firsts = order[starts]
+        return [(fork_coords[firsts[g]], xyz[starts[g]:ends[g]]) for g in np.argsort(firsts)]
+    
+    def _fork_geometry(self, spiral_system):
+        """Collect fork polylines by fork type and the main-to-fork connector segments."""
+        main_by_index = {main_coord.get('index'): main_coord for main_coord in spiral_system['main_spiral']}
+        connector_segments = []
+        connector_colors = []
+        
+        # Collect each fork group's polyline under its fork type
+        polylines_by_type = {}
+        for first, xyz in self._group_forks(spiral_system['fork_spirals']):
+            fork_type = first['fork_type']
+            polylines_by_type.setdefault(fork_type, []).append(xyz)
+            
+            # Connect main spiral to fork start
+            main_parent = main_by_index.get(first['fork_parent'])
+            if main_parent:
+                connector_segments.append([main_parent['coords'], first['coords']])
+                connector_colors.append(self._rgba.get(fork_type, self._default_rgba))
+        
+        return polylines_by_type, connector_segments, connector_colors
     
     def visualize_3d_spiral_system(self, spiral_system):
-        """Create 3D visualization of complete spiral system with forks."""
-        fig = plt.figure(figsize=(15, 10))
-        ax = fig.add_subplot(111, projection='3d')
+        """Create 3D visualization of complete spiral system with forks.
+        
+        The figure is reused: later calls redraw and return it until it is closed.
+        """
+        fig, ax = self._axes_3d()
         
         # Plot main spiral
         main_coords = spiral_system['main_spiral']
         if main_coords:
-            x_main = [coord['coords'][0] for coord in main_coords]
-            y_main = [coord['coords'][1] for coord in main_coords]
-            z_main = [coord['coords'][2] for coord in main_coords]
+            x_main, y_main, z_main = self._coord_array(main_coords).T
             
             ax.plot(x_main, y_main, z_main, 
-                   color=self.colors['main'], linewidth=3, 
+                   color=self._rgba['main'], linewidth=3, 
                    label='Main Process Flow', alpha=0.8)
             ax.scatter(x_main, y_main, z_main, 
-                      color=self.colors['main'], s=50, alpha=0.9)
+                      color=self._rgba['main'], s=50, alpha=0.9)
         
         # Plot fork spirals
-        fork_coords = spiral_system['fork_spirals']
-        fork_groups = {}
-        
-        # Group fork coordinates by parent and type
-        for coord in fork_coords:
-            key = f"{coord['fork_parent']}_{coord['fork_type']}_{coord['branch_index']}"
-            if key not in fork_groups:
-                fork_groups[key] = []
-            fork_groups[key].append(coord)
-        
-        # Plot each fork group
-        for fork_key, coords in fork_groups.items():
-            if coords:
-                fork_type = coords[0]['fork_type']
-                color = self.colors.get(fork_type, '#888888')
-                
-                x_fork = [coord['coords'][0] for coord in coords]
-                y_fork = [coord['coords'][1] for coord in coords]
-                z_fork = [coord['coords'][2] for coord in coords]
-                
-                ax.plot(x_fork, y_fork, z_fork, 
-                       color=color, linewidth=2, 
-                       label=f'{fork_type.title()} Fork', alpha=0.7)
-                ax.scatter(x_fork, y_fork, z_fork, 
-                          color=color, s=30, alpha=0.8)
-                
-                # Draw connection lines from main spiral to fork start
-                if coords:
-                    main_parent = None
-                    for main_coord in main_coords:
-                        if main_coord.get('index') == coords[0]['fork_parent']:
-                            main_parent = main_coord
-                            break
-                    
-                    if main_parent:
-                        ax.plot([main_parent['coords'][0], coords[0]['coords'][0]],
-                               [main_parent['coords'][1], coords[0]['coords'][1]],
-                               [main_parent['coords'][2], coords[0]['coords'][2]],
-                               color=color, linestyle='--', alpha=0.5)
+        polylines_by_type, connector_segments, connector_colors = self._fork_geometry(spiral_system)
+        
+        # Plot each fork type as one line collection and one scatter
+        for fork_type, polylines in polylines_by_type.items():
+            color = self._rgba.get(fork_type, self._default_rgba)
+            ax.add_collection3d(Line3DCollection(polylines, colors=color, linewidths=2,
+                                                 label=f'{fork_type.title()} Fork', alpha=0.7))
+            
+            x_fork, y_fork, z_fork = np.concatenate(polylines).T
+            ax.scatter(x_fork, y_fork, z_fork, 
+                      color=color, s=30, alpha=0.8)
+        
+        # Draw every connection line as one artist
+        if connector_segments:
+            ax.add_collection3d(Line3DCollection(connector_segments, colors=np.array(connector_colors),
+                                                 linestyles='dashed', alpha=0.5))
         
         ax.set_xlabel('X (Left-Right Forks)')
         ax.set_ylabel('Y (Process Flow)')
@@ -83,42 +153,95 @@ class ForkVisualizer:
         
         return fig
     
+    def visualize_3d_vispy(self, spiral_system):
+        """Create an interactive GPU-rendered 3D view; uses matplotlib when vispy is missing."""
+        if scene is None:
+            return self.visualize_3d_spiral_system(spiral_system)
+        
+        canvas = scene.SceneCanvas(keys='interactive', size=(1500, 1000), show=False,
+                                   title='DNA Spiral Code Map with Fork Visualization')
+        view = canvas.central_widget.add_view()
+        view.camera = 'turntable'
+        
+        # Every marker goes into one vertex buffer
+        marker_pos = []
+        marker_colors = []
+        marker_sizes = []
+        
+        main_coords = spiral_system['main_spiral']
+        if main_coords:
+            main_xyz = self._coord_array(main_coords)
+            main_rgb = self._rgba['main'][:3]
+            scene.visuals.Line(pos=main_xyz, color=main_rgb + (0.8,),
+                               width=3, parent=view.scene)
+            marker_pos.append(main_xyz)
+            marker_colors.append(np.tile(main_rgb + (0.9,), (len(main_xyz), 1)))
+            marker_sizes.append(np.full(len(main_xyz), 7.0))
+        
+        polylines_by_type, connector_segments, connector_colors = self._fork_geometry(spiral_system)
+        
+        # One line visual per fork type; connect pairs keep the polylines apart
+        for fork_type, polylines in polylines_by_type.items():
+            rgb = self._rgba.get(fork_type, self._default_rgba)[:3]
+            pos = np.concatenate(polylines)
+            starts = np.cumsum([0] + [len(polyline) for polyline in polylines[:-1]])
+            connect = np.concatenate([
+                np.column_stack((np.arange(start, start + len(polyline) - 1),
+                                 np.arange(start + 1, start + len(polyline))))
+                for start, polyline in zip(starts, polylines)
+            ]).astype(np.uint32)
+            if len(connect):
+                scene.visuals.Line(pos=pos, connect=connect, color=rgb + (0.7,),
+                                   width=2, parent=view.scene)
+            marker_pos.append(pos)
+            marker_colors.append(np.tile(rgb + (0.8,), (len(pos), 1)))
+            marker_sizes.append(np.full(len(pos), 5.5))
+        
+        if connector_segments:
+            connector_rgba = np.repeat(np.array(connector_colors), 2, axis=0)
+            connector_rgba[:, 3] = 0.5
+            scene.visuals.Line(pos=np.array(connector_segments, dtype=np.float64).reshape(-1, 3),
+                               connect='segments', color=connector_rgba,
+                               parent=view.scene)
+        
+        if marker_pos:
+            markers = scene.visuals.Markers(parent=view.scene)
+            markers.set_data(pos=np.concatenate(marker_pos), face_color=np.concatenate(marker_colors),
+                             size=np.concatenate(marker_sizes), edge_width=0)
+        
+        view.camera.set_range()
+        return canvas
+    
     def generate_2d_birds_eye_with_forks(self, spiral_system):
-        """Generate 2D bird's eye view showing fork relationships."""
-        fig, ax = plt.subplots(figsize=(12, 12))
+        """Generate 2D bird's eye view showing fork relationships.
+        
+        The figure is reused: later calls redraw and return it until it is closed.
+        """
+        fig, ax = self._axes_2d()
         
         # Plot main spiral in 2D
         main_coords = spiral_system['main_spiral']
         if main_coords:
-            x_main = [coord['coords'][0] for coord in main_coords]
-            y_main = [coord['coords'][1] for coord in main_coords]
+            x_main, y_main, _ = self._coord_array(main_coords).T
             
-            ax.plot(x_main, y_main, color=self.colors['main'], 
+            ax.plot(x_main, y_main, color=self._rgba['main'], 
                    linewidth=3, label='Main Process', alpha=0.8)
-            ax.scatter(x_main, y_main, color=self.colors['main'], 
+            ax.scatter(x_main, y_main, color=self._rgba['main'], 
                       s=100, alpha=0.9, zorder=5)
         
         # Plot fork spirals in 2D
-        fork_coords = spiral_system['fork_spirals']
-        fork_groups = {}
-        
-        for coord in fork_coords:
-            key = f"{coord['fork_parent']}_{coord['fork_type']}_{coord['branch_index']}"
-            if key not in fork_groups:
-                fork_groups[key] = []
-            fork_groups[key].append(coord)
-        
-        for fork_key, coords in fork_groups.items():
-            if coords:
-                fork_type = coords[0]['fork_type']
-                color = self.colors.get(fork_type, '#888888')
-                
-                x_fork = [coord['coords'][0] for coord in coords]
-                y_fork = [coord['coords'][1] for coord in coords]
-                
-                ax.plot(x_fork, y_fork, color=color, linewidth=2, 
-                       label=f'{fork_type.title()}', alpha=0.7)
-                ax.scatter(x_fork, y_fork, color=color, s=60, alpha=0.8)
+        polylines_by_type = {}
+        for first, xyz in self._group_forks(spiral_system['fork_spirals']):
+            polylines_by_type.setdefault(first['fork_type'], []).append(xyz[:, :2])
+        
+        # One line collection and one scatter per fork type
+        for fork_type, polylines in polylines_by_type.items():
+            color = self._rgba.get(fork_type, self._default_rgba)
+            ax.add_collection(LineCollection(polylines, colors=color, linewidths=2,
+                                             label=f'{fork_type.title()}', alpha=0.7))
+            
+            x_fork, y_fork = np.concatenate(polylines).T
+            ax.scatter(x_fork, y_fork, color=color, s=60, alpha=0.8)
         
         ax.set_xlabel('X Position (Fork Direction)')
         ax.set_ylabel('Y Position (Process Flow)')
@@ -1,26 +1,79 @@
 # src/visualization/map_generator.py
 import json
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class MapGenerator:
     def __init__(self, workflow, execution_map):
         self.workflow = workflow
         self.execution_map = execution_map
-        self.map_data = []
+        # Map columns, one row per workflow address
+        self.addresses = []
+        self.commands = []
+        self.subprocesses = []
+        self.directions = []
+        self.coords = np.empty((0, 3), dtype=np.float32)
+        self._map_data = None
 
-    def generate_map(self):
-        """Generate 3D map data combining parsed code and execution trace."""
-        for address, details in self.workflow.items():
-            coords = self.execution_map.get(address, [{'coords': [0, 0, 0]}])[0]['coords']
-            self.map_data.append({
+    @property
+    def map_data(self):
+        """Map entries as records, built from the columns on first use."""
+        if self._map_data is None:
+            self._map_data = self._records(self.coords.tolist())
+        return self._map_data
+
+    def _records(self, coord_rows):
+        """Zip the columns into map entries, using the given coordinate rows."""
+        return [
+            {
                 'address': address,
-                'command': details['command'],
+                'command': command,
                 'coords': coords,
-                'subprocesses': details['subprocesses'],
-                'direction': details['direction']
-            })
-        return self.map_data
+                'subprocesses': subprocesses,
+                'direction': direction
+            }
+            for address, command, coords, subprocesses, direction in zip(
+                self.addresses, self.commands, coord_rows,
+                self.subprocesses, self.directions)
+        ]
+
+    def generate_map(self):
+        """Generate 3D map columns combining parsed code and execution trace."""
+        addresses, commands, subprocesses, directions = [], [], [], []
+        coords = np.zeros((len(self.workflow), 3), dtype=np.float32)
+        for i, (address, details) in enumerate(self.workflow.items()):
+            addresses.append(address)
+            commands.append(details['command'])
+            subprocesses.append(details['subprocesses'])
+            directions.append(details['direction'])
+            events = self.execution_map.get(address)
+            if events:
+                coords[i] = events[0]['coords']
+
+        self.addresses, self.commands = addresses, commands
+        self.subprocesses, self.directions = subprocesses, directions
+        self.coords = coords
+        self._map_data = None
+        return {
+            'addresses': addresses,
+            'commands': commands,
+            'coords': coords,
+            'subprocesses': subprocesses,
+            'directions': directions
+        }
 
     def save_map(self, output_file):
         """Save map data to JSON for Three.js."""
-        with open(output_file, 'w') as f:
-            json.dump(self.map_data, f, indent=2)
+        # Three decimals is plenty for display and keeps float32 noise out of the file
+        records = self._records(self.coords.astype(np.float64).round(3).tolist())
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(records, f, indent=2)
@@ -11,6 +11,10 @@ class ViewController:
             'show_connections': True,
             'show_labels': True
         }
+        self._filter_cache = (None, {})  # (view_data, {(view, categories): result})
+        self._indexed_view_data = None
+        self._node_index_3d = {}
+        self._node_index_2d = {}
     
     def switch_view(self, target_view):
         """Switch between 3D spiral and 2D bird's eye views."""
@@ -39,8 +43,9 @@ class ViewController:
     
     def focus_on_node(self, node_id, view_data):
         """Focus camera/view on specific node."""
+        self._index_view_data(view_data)
         if self.current_view == '3d_spiral':
-            node = next((n for n in view_data['spiral_3d']['nodes'] if n['id'] == node_id), None)
+            node = self._node_index_3d.get(node_id)
             if node:
                 return {
                     'camera_target': node['position'],
@@ -48,7 +53,7 @@ class ViewController:
                     'highlight_node': node_id
                 }
         else:
-            node = next((n for n in view_data['birds_eye_2d']['nodes'] if n['id'] == node_id), None)
+            node = self._node_index_2d.get(node_id)
             if node:
                 return {
                     'center': node['position_2d'],
@@ -58,34 +63,60 @@ class ViewController:
         
         return None
     
+    def _index_view_data(self, view_data):
+        """Index both views' nodes by id, keeping the first node for any repeated id."""
+        if view_data is self._indexed_view_data:
+            return
+        
+        self._node_index_3d = {}
+        for n in view_data['spiral_3d']['nodes']:
+            self._node_index_3d.setdefault(n['id'], n)
+        self._node_index_2d = {}
+        for n in view_data['birds_eye_2d']['nodes']:
+            self._node_index_2d.setdefault(n['id'], n)
+        self._indexed_view_data = view_data
+    
     def filter_by_category(self, categories, view_data):
         """Filter view to show only specific categories."""
         self.filter_settings['categories'] = set(categories)
         
-        if self.current_view == '3d_spiral':
-            filtered_nodes = [n for n in view_data['spiral_3d']['nodes'] 
-                            if n['category'] in categories or not categories]
-            return {
-                'visible_nodes': [n['id'] for n in filtered_nodes],
-                'hidden_nodes': [n['id'] for n in view_data['spiral_3d']['nodes'] 
-                               if n not in filtered_nodes]
-            }
-        else:
-            filtered_nodes = [n for n in view_data['birds_eye_2d']['nodes'] 
-                            if n['category'] in categories or not categories]
-            return {
-                'visible_nodes': [n['id'] for n in filtered_nodes],
-                'hidden_nodes': [n['id'] for n in view_data['birds_eye_2d']['nodes'] 
-                               if n not in filtered_nodes]
-            }
+        # Results depend only on the view, the nodes and the category set
+        cached_view_data, filter_cache = self._filter_cache
+        if cached_view_data is not view_data:
+            filter_cache = {}
+            self._filter_cache = (view_data, filter_cache)
+        key = (self.current_view, frozenset(categories))
+        cached = filter_cache.get(key)
+        if cached is None:
+            cached = filter_cache[key] = self._filter_nodes(view_data, categories)
+        
+        # Callers get their own lists; the cache keeps tuples
+        visible_nodes, hidden_nodes = cached
+        return {
+            'visible_nodes': list(visible_nodes),
+            'hidden_nodes': list(hidden_nodes)
+        }
+    
+    def _filter_nodes(self, view_data, categories):
+        """Split the current view's node ids into (visible, hidden) tuples."""
+        view_key = 'spiral_3d' if self.current_view == '3d_spiral' else 'birds_eye_2d'
+        visible_nodes, hidden_nodes = [], []
+        for n in view_data[view_key]['nodes']:
+            if n['category'] in categories or not categories:
+                visible_nodes.append(n['id'])
+            else:
+                hidden_nodes.append(n['id'])
+        
+        return tuple(visible_nodes), tuple(hidden_nodes)
     
     def select_nodes(self, node_ids):
         """Select multiple nodes for operations."""
         self.selected_nodes.update(node_ids)
-        return {
-            'selected_count': len(self.selected_nodes),
-            'selected_nodes': list(self.selected_nodes)
-        }
+        return {'selected_count': len(self.selected_nodes)}
+    
+    def get_selected_nodes(self):
+        """Get the selected node ids as a list."""
+        return list(self.selected_nodes)
     
     def clear_selection(self):
         """Clear all selected nodes."""
@@ -96,18 +127,24 @@ class ViewController:
         """Get current view state for persistence."""
         return {
             'current_view': self.current_view,
-            'view_history': self.view_history,
+            'view_history': list(self.view_history),
             'selected_nodes': list(self.selected_nodes),
-            'filter_settings': self.filter_settings.copy()
+            'filter_settings': self._copy_filter_settings(self.filter_settings)
         }
     
+    def _copy_filter_settings(self, filter_settings):
+        """Copy filter settings, including the category set, so saved and live state stay apart."""
+        return {name: set(value) if isinstance(value, (set, frozenset)) else value
+                for name, value in filter_settings.items()}
+    
     def restore_view_state(self, state):
         """Restore view state from saved data."""
+        self._indexed_view_data = None
         self.current_view = state.get('current_view', '3d_spiral')
-        self.view_history = state.get('view_history', [])
+        self.view_history = list(state.get('view_history', []))
         self.selected_nodes = set(state.get('selected_nodes', []))
-        self.filter_settings = state.get('filter_settings', {
+        self.filter_settings = self._copy_filter_settings(state.get('filter_settings', {
             'categories': set(),
             'show_connections': True,
             'show_labels': True
-        })
+        }))